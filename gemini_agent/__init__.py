@@ -14,8 +14,8 @@ This package provides three ways to use Gemini's agentic features:
 
 3. Client: Python client for a deployed service
    >>> from gemini_agent.client import GeminiAgentClient
-   >>> client = GeminiAgentClient("http://localhost:8000")
-   >>> result = await client.run("Create a hello world script")
+   >>> async with GeminiAgentClient("http://localhost:8000") as client:
+   ...     result = await client.run("Create a hello world script")
 """
 
 from gemini_agent._version import __version__
@@ -3,9 +3,9 @@ Client module - Python client for a deployed Gemini Agent API service.
 
 Usage:
     >>> from gemini_agent.client import GeminiAgentClient
-    >>> client = GeminiAgentClient("http://localhost:8000")
-    >>> result = await client.run("Create a hello world script")
-    >>> print(result)
+    >>> async with GeminiAgentClient("http://localhost:8000") as client:
+    ...     result = await client.run("Create a hello world script")
+    ...     print(result)
 """
 
 from gemini_agent.client.client import GeminiAgentClient
@@ -6,12 +6,28 @@ a simple interface to submit tasks and retrieve results.
 """
 
 import asyncio
+import json
+import random
 import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from dataclasses import dataclass
 from typing import Any, Optional
 
 import httpx
 
+_FINISHED_STATES = ("SUCCESS", "FAILURE", "REVOKED")
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
 
 @dataclass
 class TaskResult:
@@ -25,19 +41,35 @@ class TaskResult:
     error: Optional[str] = None
 
 
+def _to_task_result(task_id: str, status: dict[str, Any]) -> TaskResult:
+    """Build a TaskResult from a finished task status payload."""
+    result = status.get("result") or {}
+    return TaskResult(
+        task_id=task_id,
+        status=status["status"],
+        success=status["status"] == "SUCCESS" and result.get("success", False),
+        response=result.get("response"),
+        modified_files=result.get("modified_files"),
+        error=status.get("error") or result.get("error"),
+    )
+
+
 class GeminiAgentClient:
     """
     Async HTTP client for the Gemini Agent API.
 
+    The client keeps one pooled HTTP connection alive across calls, so reuse a
+    single instance and close it when done (preferably via ``async with``).
+
     Example:
         >>> async with GeminiAgentClient("http://localhost:8000") as client:
         ...     result = await client.run("Create a hello world script")
         ...     print(result.response)
 
     Or with polling:
-        >>> client = GeminiAgentClient("http://localhost:8000")
-        >>> task_id = await client.submit("Create a hello world script")
-        >>> result = await client.wait_for_result(task_id)
+        >>> async with GeminiAgentClient("http://localhost:8000") as client:
+        ...     task_id = await client.submit("Create a hello world script")
+        ...     result = await client.wait_for_result(task_id)
     """
 
     def __init__(
@@ -45,6 +77,11 @@ class GeminiAgentClient:
         base_url: str = "http://localhost:8000",
         timeout: float = 300.0,
         poll_interval: float = 1.0,
+        poll_max: float = 30.0,
+        poll_jitter: bool = True,
+        long_poll: float = 25.0,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = True,
     ):
         """
         Initialize the client.
@@ -52,36 +89,56 @@ class GeminiAgentClient:
         Args:
             base_url: Base URL of the Gemini Agent API service.
             timeout: Request timeout in seconds.
-            poll_interval: Interval between status polls in seconds.
+            poll_interval: Initial interval between status polls in seconds.
+                The interval doubles after every poll, up to poll_max.
+            poll_max: Maximum interval between status polls in seconds.
+            poll_jitter: Randomize each interval (full jitter) to spread out polls.
+            long_poll: Seconds the server may hold each status poll open waiting for
+                the task to change state (at most 60, 0 disables long-polling).
+            limits: Connection pool limits (keeps up to 20 connections alive for 15s
+                by default).
+            http2: Multiplex concurrent requests over one HTTP/2 connection when the
+                server supports it (https only; requires the http2 extra, otherwise
+                HTTP/1.1 is used).
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.poll_interval = poll_interval
+        self.poll_max = poll_max
+        self.poll_jitter = poll_jitter
+        self.long_poll = long_poll
+        self.limits = limits or httpx.Limits(max_keepalive_connections=20, keepalive_expiry=15.0)
+        self.http2 = http2
         self._client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self) -> "GeminiAgentClient":
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=self.timeout,
-        )
+        self._get_client()
         return self
 
     async def __aexit__(self, *args) -> None:
         """Async context manager exit."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        await self.close()
 
     def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
+        """Get or create the shared HTTP client."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=self.timeout,
-            )
+            options = {"base_url": self.base_url, "timeout": self.timeout, "limits": self.limits}
+            try:
+                self._client = httpx.AsyncClient(http2=self.http2, **options)
+            except ImportError:
+                # h2 is not installed; fall back to HTTP/1.1
+                self._client = httpx.AsyncClient(**options)
         return self._client
 
+    def _poll_delay(self, attempt: int) -> float:
+        """Exponential backoff delay before the next status poll."""
+        # Cap the exponent so long waits cannot overflow the float conversion
+        delay = min(self.poll_max, self.poll_interval * 2 ** min(attempt, 32))
+        if self.poll_jitter:
+            return random.uniform(0, delay)
+        return delay
+
     async def health(self) -> dict[str, Any]:
         """Check service health."""
         client = self._get_client()
@@ -144,13 +201,52 @@ class GeminiAgentClient:
         response.raise_for_status()
         return response.json()["task_id"]
 
-    async def get_status(self, task_id: str) -> dict[str, Any]:
-        """Get the status of a task."""
+    async def _fetch_status(self, task_id: str, wait: Optional[float] = None) -> httpx.Response:
+        """Request the status of a task, optionally long-polling on the server."""
         client = self._get_client()
-        response = await client.get(f"/tasks/{task_id}")
+        if wait:
+            # Extend the request timeout by the time the server may hold the request
+            response = await client.get(
+                f"/tasks/{task_id}", params={"wait": wait}, timeout=self.timeout + wait
+            )
+        else:
+            response = await client.get(f"/tasks/{task_id}")
         response.raise_for_status()
+        return response
+
+    async def get_status(self, task_id: str, wait: Optional[float] = None) -> dict[str, Any]:
+        """
+        Get the status of a task.
+
+        Args:
+            task_id: The task ID to query.
+            wait: Seconds the server may wait for a state change before responding.
+
+        Returns:
+            Task status payload.
+        """
+        response = await self._fetch_status(task_id, wait=wait)
         return response.json()
 
+    async def stream_result(self, task_id: str) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream status updates for a task as the server pushes them.
+
+        Args:
+            task_id: The task ID to follow.
+
+        Yields:
+            Task status payloads, ending with the finished status.
+        """
+        client = self._get_client()
+        # The server sends keep-alive comments, so only connect/write timeouts apply
+        timeout = httpx.Timeout(self.timeout, read=None)
+        async with client.stream("GET", f"/tasks/{task_id}/events", timeout=timeout) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    yield json.loads(line[5:])
+
     async def wait_for_result(
         self,
         task_id: str,
@@ -159,6 +255,9 @@ class GeminiAgentClient:
         """
         Wait for a task to complete and return the result.
 
+        Follows the server's event stream, falling back to long-polling when the
+        server does not provide one or the stream is interrupted.
+
         Args:
             task_id: The task ID to wait for.
             timeout: Maximum time to wait (uses client timeout if not specified).
@@ -170,29 +269,59 @@ class GeminiAgentClient:
             TimeoutError: If the task doesn't complete within the timeout.
         """
         timeout = timeout or self.timeout
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+
+        try:
+            async with asyncio.timeout(timeout):
+                async with aclosing(self.stream_result(task_id)) as events:
+                    async for status in events:
+                        if status["status"] in _FINISHED_STATES:
+                            return _to_task_result(task_id, status)
+        except TimeoutError:
+            raise TimeoutError(f"Task {task_id} did not complete within {timeout}s") from None
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+        except httpx.TransportError:
+            pass
+
+        return await self._poll_for_result(task_id, deadline, timeout)
+
+    async def _poll_for_result(self, task_id: str, deadline: float, timeout: float) -> TaskResult:
+        """Poll task status until it finishes or the deadline passes."""
+        attempt = 0
 
         while True:
-            status = await self.get_status(task_id)
-
-            if status["status"] in ("SUCCESS", "FAILURE", "REVOKED"):
-                result = status.get("result", {})
-                return TaskResult(
-                    task_id=task_id,
-                    status=status["status"],
-                    success=status["status"] == "SUCCESS" and result.get("success", False),
-                    response=result.get("response"),
-                    modified_files=result.get("modified_files"),
-                    error=status.get("error") or result.get("error"),
-                )
-
-            if time.time() - start_time > timeout:
+            wait = min(self.long_poll, deadline - time.monotonic())
+            retry_after = None
+            try:
+                response = await self._fetch_status(task_id, wait=wait if wait > 0 else None)
+            except httpx.TransportError:
+                # Transient network error: keep waiting, starting over from the base interval
+                attempt = 0
+            else:
+                status = response.json()
+                if status["status"] in _FINISHED_STATES:
+                    return _to_task_result(task_id, status)
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+
+            if time.monotonic() > deadline:
                 raise TimeoutError(f"Task {task_id} did not complete within {timeout}s")
 
-            await asyncio.sleep(self.poll_interval)
+            # Prefer the server's estimate over the client-side backoff
+            if retry_after is None:
+                retry_after = self._poll_delay(attempt)
+            # Never sleep past the deadline; one last poll runs when it is reached
+            await asyncio.sleep(min(retry_after, max(deadline - time.monotonic(), 0)))
+            attempt += 1
 
     async def cancel(self, task_id: str) -> None:
-        """Cancel a pending or running task."""
+        """
+        Cancel a pending or running task.
+
+        Running tasks are only terminated when the server's workers use the
+        prefork pool (the default).
+        """
         client = self._get_client()
         response = await client.delete(f"/tasks/{task_id}")
         response.raise_for_status()
@@ -274,7 +403,7 @@ class GeminiAgentClient:
         return response.json()
 
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client and its pooled connections."""
         if self._client:
             await self._client.aclose()
             self._client = None
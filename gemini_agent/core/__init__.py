@@ -10,7 +10,8 @@ Usage:
     >>> print(result.response)
 """
 
-from gemini_agent.core.agent import GeminiAgent
+from gemini_agent.core.agent import GeminiAgent, wait_for_cleanup
 from gemini_agent.core.models import AgentResult, AgentConfig
+from gemini_agent.core.pool import get_agent
 
-__all__ = ["GeminiAgent", "AgentResult", "AgentConfig"]
+__all__ = ["GeminiAgent", "AgentResult", "AgentConfig", "get_agent", "wait_for_cleanup"]
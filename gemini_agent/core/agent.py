@@ -5,18 +5,237 @@ This class provides a Pythonic interface to the Gemini CLI's agentic capabilitie
 Requires Node.js and @google/gemini-cli to be installed.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import mmap
 import os
+import shutil
+import signal
 import subprocess
 import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
+from gemini_agent.core.cli_detect import detect_gemini_cli
 from gemini_agent.core.models import AgentConfig, AgentResult, ApprovalMode, OutputFormat
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; both raise ValueError subclasses on bad input
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Version control, dependency and bytecode cache directories never hold task output
+_SKIPPED_DIRS = frozenset(
+    {".git", ".hg", ".svn", "node_modules", ".venv", "venv", ".tox", "__pycache__"}
+)
+
+# Digest size for detecting changed input files (128-bit BLAKE2b)
+_DIGEST_SIZE = 16
+
+# Files at least this large are hashed through mmap instead of buffered reads
+_MMAP_THRESHOLD = 10 * 1024 * 1024
+
+# Longest stream-json line buffered when reading CLI output incrementally
+_STREAM_LINE_LIMIT = 32 * 1024 * 1024
+
+# Temporary workspaces are deleted off the caller's path; pending deletions
+# are tracked so shutdown can wait for them
+_cleanup_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini-cleanup")
+_pending_cleanups: set[Future] = set()
+_pending_lock = threading.Lock()
+
+# Post-run file hashing and reads, shared by all agents; hashing releases the
+# GIL, so concurrent runs on one worker process files in parallel
+_io_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="gemini-io")
+
+
+def _schedule_cleanup(path: str) -> None:
+    """Delete a temporary workspace in the background."""
+    future = _cleanup_executor.submit(shutil.rmtree, path, ignore_errors=True)
+    with _pending_lock:
+        _pending_cleanups.add(future)
+    future.add_done_callback(_cleanup_done)
+
+
+def _cleanup_done(future: Future) -> None:
+    with _pending_lock:
+        _pending_cleanups.discard(future)
+
+
+def wait_for_cleanup(timeout: Optional[float] = None) -> bool:
+    """
+    Wait for background deletion of temporary workspaces to finish.
+
+    Args:
+        timeout: Maximum seconds to wait (None waits indefinitely).
+
+    Returns:
+        True if no cleanups are still pending.
+    """
+    with _pending_lock:
+        pending = list(_pending_cleanups)
+    _, not_done = wait(pending, timeout=timeout)
+    return not not_done
+
+
+def _new_digest(data: bytes = b"") -> hashlib.blake2b:
+    """Create a BLAKE2b hash used for file change detection."""
+    return hashlib.blake2b(data, digest_size=_DIGEST_SIZE)
+
+
+def _file_digest(path: Path) -> bytes:
+    """Digest a file's contents without loading it into Python memory."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _new_digest(mapped).digest()
+        return hashlib.file_digest(f, _new_digest).digest()
+
+
+def _read_modified(
+    work_path: Path, initial_digests: dict[str, bytes], relative_path: str
+) -> Optional[str]:
+    """Read a changed file's text, or None if it is binary or matches its input."""
+    file_path = work_path / relative_path
+    try:
+        # Input files that were rewritten with the same content are not modified
+        initial_digest = initial_digests.get(relative_path)
+        if initial_digest is not None and _file_digest(file_path) == initial_digest:
+            return None
+        return file_path.read_bytes().decode("utf-8")
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+def _resolve_inputs(work_path: Path, files: dict[str, str]) -> dict[str, tuple[Path, bytes]]:
+    """Map input filenames to their encoded content and destination inside work_path."""
+    work_root = work_path.resolve()
+    inputs: dict[str, tuple[Path, bytes]] = {}
+
+    for filename, content in files.items():
+        file_path = (work_root / filename).resolve()
+        # Security: ensure path is within working directory
+        if not file_path.is_relative_to(work_root):
+            logger.warning(f"Blocked path traversal attempt: {filename}")
+            continue
+        inputs[filename] = (file_path, content.encode("utf-8"))
+
+    for parent in {file_path.parent for file_path, _ in inputs.values()}:
+        parent.mkdir(parents=True, exist_ok=True)
+    return inputs
+
+
+def _input_digests(inputs: dict[str, tuple[Path, bytes]]) -> dict[str, bytes]:
+    """Digest the content of each input file."""
+    return {filename: _new_digest(data).digest() for filename, (_, data) in inputs.items()}
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    """Kill the CLI along with any tool processes it spawned."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except AttributeError:  # Windows has no process groups
+        proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _list_flag(flag: str, values: Optional[list[str]]) -> tuple[str, ...]:
+    """Render a variadic CLI flag, or nothing when there are no values."""
+    return (flag, *values) if values else ()
+
+
+def _scan_files(root: Path) -> dict[str, tuple[int, int]]:
+    """Map files under root (by relative path) to their (size, mtime_ns)."""
+    stats: dict[str, tuple[int, int]] = {}
+    pending = [("", os.fspath(root))]
+
+    while pending:
+        prefix, directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Top-level dot entries hold tool state (.gemini, .git, ...), not task output
+                    if not prefix and entry.name.startswith("."):
+                        continue
+                    relative_path = prefix + entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _SKIPPED_DIRS:
+                                pending.append((relative_path + os.sep, entry.path))
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            stats[relative_path] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    return stats
+
+
+@dataclass
+class _StreamState:
+    """Accumulates the final response from stream-json CLI events."""
+
+    session_id: Optional[str] = None
+    chunks: list[str] = field(default_factory=list)
+    result: Optional[dict[str, Any]] = None
+    raw_lines: list[str] = field(default_factory=list)
+    last_type: Optional[str] = None
+
+    def feed(self, line: bytes) -> Optional[dict[str, Any]]:
+        """Consume one raw output line, returning the parsed event if it was JSON."""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            event = _json_loads(line)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            self.raw_lines.append(line.decode("utf-8", errors="replace"))
+            return None
+
+        event_type = event.get("type")
+        if event_type == "init":
+            self.session_id = event.get("session_id")
+        elif event_type == "message" and event.get("role") == "assistant":
+            # Tool calls split the conversation; keep only the last assistant message
+            if self.last_type != "assistant":
+                self.chunks.clear()
+            self.chunks.append(event.get("content", ""))
+        elif event_type == "result":
+            self.result = event
+        self.last_type = "assistant" if event.get("role") == "assistant" else event_type
+        return event
+
+    def response(self) -> Optional[dict[str, Any]]:
+        """Build the response payload from the events seen so far."""
+        if self.result is None and not self.chunks:
+            return {"raw_output": "\n".join(self.raw_lines)} if self.raw_lines else None
+
+        response: dict[str, Any] = {"response": "".join(self.chunks)}
+        if self.session_id:
+            response["session_id"] = self.session_id
+        if self.result is not None:
+            response["stats"] = self.result.get("stats")
+            if self.result.get("error"):
+                response["error"] = self.result["error"]
+        return response
+
 
 class GeminiAgent:
     """
@@ -60,27 +279,16 @@ class GeminiAgent:
             sandbox=sandbox,
             output_format=output_format,
         )
+        self._env = self._build_env()
         self._verify_cli_installed()
 
     def _verify_cli_installed(self) -> None:
         """Verify that Gemini CLI is installed and accessible."""
-        try:
-            result = subprocess.run(
-                ["gemini", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
-                logger.debug(f"Gemini CLI version: {result.stdout.strip()}")
-            else:
-                logger.warning("Gemini CLI found but returned non-zero exit code")
-        except FileNotFoundError:
-            raise RuntimeError(
-                "Gemini CLI not found. Please install it with: " "npm install -g @google/gemini-cli"
-            )
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Gemini CLI version check timed out")
+        version = detect_gemini_cli()
+        if version is None:
+            logger.warning("Gemini CLI found but returned non-zero exit code")
+        else:
+            logger.debug(f"Gemini CLI version: {version}")
 
     def run(
         self,
@@ -133,9 +341,64 @@ class GeminiAgent:
             )
         finally:
             if use_temp_dir:
-                import shutil
+                _schedule_cleanup(temp_dir)
 
-                shutil.rmtree(temp_dir, ignore_errors=True)
+    async def arun(
+        self,
+        prompt: str,
+        *,
+        files: Optional[dict[str, str]] = None,
+        mcp_servers: Optional[list[str]] = None,
+        allowed_tools: Optional[list[str]] = None,
+        extensions: Optional[list[str]] = None,
+        include_directories: Optional[list[str]] = None,
+        working_directory: Optional[str] = None,
+        resume_session: Optional[str] = None,
+        on_event: Optional[Callable[[dict[str, Any]], Any]] = None,
+    ) -> AgentResult:
+        """
+        Execute a prompt with Gemini CLI without blocking the event loop.
+
+        Takes the same arguments as run(). The CLI runs as an asyncio subprocess
+        and workspace file I/O is done in worker threads, so many invocations can
+        be supervised concurrently from one event loop.
+
+        With the stream-json output format, CLI events are parsed as they are
+        written instead of buffering the whole output, and stdout is not kept on
+        the result.
+
+        Args:
+            on_event: Called with each parsed stream-json event as it arrives
+                (e.g. an asyncio.Queue's put_nowait).
+
+        Returns:
+            AgentResult with success status, response, and any modified files.
+        """
+        files = files or {}
+        use_temp_dir = working_directory is None
+
+        if use_temp_dir:
+            temp_dir = tempfile.mkdtemp(prefix="gemini_agent_")
+            work_path = Path(temp_dir)
+        else:
+            work_path = Path(working_directory)
+            work_path.mkdir(parents=True, exist_ok=True)
+
+        try:
+            return await self._aexecute(
+                prompt=prompt,
+                work_path=work_path,
+                files=files,
+                mcp_servers=mcp_servers,
+                allowed_tools=allowed_tools,
+                extensions=extensions,
+                include_directories=include_directories,
+                resume_session=resume_session,
+                on_event=on_event,
+            )
+        finally:
+            if use_temp_dir:
+                _schedule_cleanup(temp_dir)
 
     def _execute(
         self,
@@ -149,65 +412,22 @@ class GeminiAgent:
         resume_session: Optional[str],
     ) -> AgentResult:
         """Execute the CLI command."""
-        initial_files: dict[str, str] = {}
-
-        for filename, content in files.items():
-            file_path = (work_path / filename).resolve()
-            # Security: ensure path is within working directory
-            if not str(file_path).startswith(str(work_path.resolve())):
-                logger.warning(f"Blocked path traversal attempt: {filename}")
-                continue
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content, encoding="utf-8")
-            initial_files[filename] = content
-
-        command = ["gemini", "--output-format", self.config.output_format.value]
-
-        if self.config.model:
-            command.extend(["--model", self.config.model])
-
-        if self.config.approval_mode == ApprovalMode.YOLO:
-            command.append("-y")
-        elif self.config.approval_mode in (ApprovalMode.DEFAULT, ApprovalMode.AUTO_EDIT):
-            command.extend(["--approval-mode", self.config.approval_mode.value])
-
-        if self.config.sandbox:
-            command.append("--sandbox")
-
-        if mcp_servers:
-            command.append("--allowed-mcp-server-names")
-            command.extend(mcp_servers)
-
-        if allowed_tools:
-            command.append("--allowed-tools")
-            command.extend(allowed_tools)
-
-        if extensions:
-            command.append("--extensions")
-            command.extend(extensions)
-
-        if include_directories:
-            for directory in include_directories:
-                command.extend(["--include-directories", directory])
-
-        if resume_session:
-            command.extend(["--resume", resume_session])
-
-        command.append(prompt)
-
-        env = os.environ.copy()
-        if self.config.api_key:
-            env["GEMINI_API_KEY"] = self.config.api_key
+        initial_digests, initial_stats = self._prepare_workspace(work_path, files)
+        command = self._build_command(
+            prompt, mcp_servers, allowed_tools, extensions, include_directories, resume_session
+        )
 
-        logger.debug(f"Executing: {' '.join(command[:-1])} '<prompt>'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing: %s '<prompt>'", " ".join(command[:-1]))
 
         try:
             result = subprocess.run(
                 command,
                 cwd=work_path,
-                env=env,
+                env=self._env,
                 capture_output=True,
-                text=True,
+                # Only inheritable fds would survive; skipping the close pass is safe
+                close_fds=False,
                 timeout=self.config.timeout,
             )
         except subprocess.TimeoutExpired:
@@ -215,36 +435,208 @@ class GeminiAgent:
         except Exception as e:
             return AgentResult.from_error(str(e))
 
-        response = None
-        if result.stdout:
-            if self.config.output_format == OutputFormat.JSON:
-                try:
-                    response = json.loads(result.stdout)
-                except json.JSONDecodeError:
-                    response = {"raw_output": result.stdout}
+        return self._build_result(
+            work_path,
+            initial_digests,
+            initial_stats,
+            response=self._parse_response(result.stdout),
+            returncode=result.returncode,
+            stdout=result.stdout.decode("utf-8", errors="replace"),
+            stderr=result.stderr.decode("utf-8", errors="replace"),
+        )
+
+    async def _aexecute(
+        self,
+        prompt: str,
+        work_path: Path,
+        files: dict[str, str],
+        mcp_servers: Optional[list[str]],
+        allowed_tools: Optional[list[str]],
+        extensions: Optional[list[str]],
+        include_directories: Optional[list[str]],
+        resume_session: Optional[str],
+        on_event: Optional[Callable[[dict[str, Any]], Any]] = None,
+    ) -> AgentResult:
+        """Execute the CLI command as an asyncio subprocess."""
+        initial_digests, initial_stats = await self._aprepare_workspace(work_path, files)
+        command = self._build_command(
+            prompt, mcp_servers, allowed_tools, extensions, include_directories, resume_session
+        )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing: %s '<prompt>'", " ".join(command[:-1]))
+
+        streaming = self.config.output_format == OutputFormat.STREAM_JSON
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=work_path,
+                env=self._env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                # Own process group, so a timeout can also stop tool subprocesses
+                start_new_session=True,
+                close_fds=False,
+                limit=_STREAM_LINE_LIMIT,
+            )
+        except Exception as e:
+            return AgentResult.from_error(str(e))
+
+        try:
+            if streaming:
+                stream, stderr = await asyncio.wait_for(
+                    self._read_stream(proc, on_event), timeout=self.config.timeout
+                )
+                stdout = ""
+                response = stream.response()
             else:
-                response = {"raw_output": result.stdout}
-
-        modified_files: dict[str, str] = {}
-        for file_path in work_path.rglob("*"):
-            if file_path.is_file():
-                relative_path = str(file_path.relative_to(work_path))
-                if relative_path.startswith("."):
-                    continue
-                try:
-                    content = file_path.read_text(encoding="utf-8")
-                    if relative_path not in initial_files:
-                        modified_files[relative_path] = content
-                    elif initial_files[relative_path] != content:
-                        modified_files[relative_path] = content
-                except (UnicodeDecodeError, Exception):
-                    pass
+                out, stderr = await asyncio.wait_for(
+                    proc.communicate(), timeout=self.config.timeout
+                )
+                response = self._parse_response(out)
+                stdout = out.decode("utf-8", errors="replace")
+        except TimeoutError:
+            _kill_process_group(proc)
+            await proc.wait()
+            return AgentResult.from_error(f"Command timed out after {self.config.timeout} seconds")
+        except asyncio.CancelledError:
+            _kill_process_group(proc)
+            raise
+        except Exception as e:
+            _kill_process_group(proc)
+            return AgentResult.from_error(str(e))
+
+        return await asyncio.to_thread(
+            self._build_result,
+            work_path,
+            initial_digests,
+            initial_stats,
+            response=response,
+            returncode=proc.returncode,
+            stdout=stdout,
+            stderr=stderr.decode("utf-8", errors="replace"),
+        )
+
+    async def _read_stream(
+        self,
+        proc: asyncio.subprocess.Process,
+        on_event: Optional[Callable[[dict[str, Any]], Any]],
+    ) -> tuple[_StreamState, bytes]:
+        """Parse stream-json events line by line while the CLI runs."""
+        # Drain stderr concurrently so a full pipe cannot stall the CLI
+        stderr_task = asyncio.ensure_future(proc.stderr.read())
+        try:
+            stream = _StreamState()
+            async for line in proc.stdout:
+                event = stream.feed(line)
+                if event is not None and on_event is not None:
+                    on_event(event)
+            stderr = await stderr_task
+            await proc.wait()
+        finally:
+            stderr_task.cancel()
+        return stream, stderr
+
+    def _prepare_workspace(
+        self, work_path: Path, files: dict[str, str]
+    ) -> tuple[dict[str, bytes], dict[str, tuple[int, int]]]:
+        """Write input files and snapshot the workspace before running the CLI."""
+        inputs = _resolve_inputs(work_path, files)
+        for file_path, data in inputs.values():
+            file_path.write_bytes(data)
+
+        # Snapshot file stats so the post-run scan only reads files that changed
+        return _input_digests(inputs), _scan_files(work_path)
+
+    async def _aprepare_workspace(
+        self, work_path: Path, files: dict[str, str]
+    ) -> tuple[dict[str, bytes], dict[str, tuple[int, int]]]:
+        """Async variant of _prepare_workspace that writes input files concurrently."""
+        inputs = await asyncio.to_thread(_resolve_inputs, work_path, files)
+        await asyncio.gather(
+            *(asyncio.to_thread(file_path.write_bytes, data) for file_path, data in inputs.values())
+        )
+        return _input_digests(inputs), await asyncio.to_thread(_scan_files, work_path)
+
+    def _build_command(
+        self,
+        prompt: str,
+        mcp_servers: Optional[list[str]],
+        allowed_tools: Optional[list[str]],
+        extensions: Optional[list[str]],
+        include_directories: Optional[list[str]],
+        resume_session: Optional[str],
+    ) -> list[str]:
+        """Build the Gemini CLI argument list."""
+        return list(
+            chain(
+                self.config.static_argv,
+                _list_flag("--allowed-mcp-server-names", mcp_servers),
+                _list_flag("--allowed-tools", allowed_tools),
+                _list_flag("--extensions", extensions),
+                chain.from_iterable(
+                    ("--include-directories", d) for d in include_directories or ()
+                ),
+                ("--resume", resume_session) if resume_session else (),
+                (prompt,),
+            )
+        )
+
+    def _build_env(self) -> dict[str, str]:
+        """Build the environment for the CLI process (shared by every run)."""
+        env = os.environ.copy()
+        if self.config.api_key:
+            env["GEMINI_API_KEY"] = self.config.api_key
+        return env
+
+    def _parse_response(self, stdout: bytes) -> Optional[dict[str, Any]]:
+        """Parse raw CLI output according to the configured output format."""
+        if not stdout:
+            return None
+
+        if self.config.output_format == OutputFormat.JSON:
+            try:
+                return _json_loads(stdout)
+            except ValueError:
+                pass
+        elif self.config.output_format == OutputFormat.STREAM_JSON:
+            stream = _StreamState()
+            for line in stdout.splitlines():
+                stream.feed(line)
+            return stream.response()
+
+        return {"raw_output": stdout.decode("utf-8", errors="replace")}
+
+    def _build_result(
+        self,
+        work_path: Path,
+        initial_digests: dict[str, bytes],
+        initial_stats: dict[str, tuple[int, int]],
+        *,
+        response: Optional[dict[str, Any]],
+        returncode: int,
+        stdout: str,
+        stderr: str,
+    ) -> AgentResult:
+        """Collect files modified during the run into the result."""
+        changed = [
+            relative_path
+            for relative_path, stats in _scan_files(work_path).items()
+            if initial_stats.get(relative_path) != stats
+        ]
+        contents = _io_pool.map(partial(_read_modified, work_path, initial_digests), changed)
+        modified_files = {
+            relative_path: content
+            for relative_path, content in zip(changed, contents)
+            if content is not None
+        }
 
         return AgentResult(
-            success=result.returncode == 0,
+            success=returncode == 0,
             response=response,
             modified_files=modified_files,
-            stdout=result.stdout,
-            stderr=result.stderr,
-            return_code=result.returncode,
+            stdout=stdout,
+            stderr=stderr,
+            return_code=returncode,
         )
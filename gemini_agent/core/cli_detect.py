@@ -0,0 +1,101 @@
+"""Gemini CLI detection shared by the core agent and the API server."""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CLI_NOT_FOUND = "Gemini CLI not found. Please install it with: npm install -g @google/gemini-cli"
+
+# Absolute path of the CLI, resolved once so launches skip the $PATH search
+GEMINI_BIN = shutil.which("gemini") or "gemini"
+
+
+class _VersionCheckFailed(Exception):
+    """``gemini --version`` exited non-zero; raised so the failure is not cached."""
+
+
+def detect_gemini_cli() -> Optional[str]:
+    """
+    Locate the Gemini CLI and return its version.
+
+    The version is cached per CLI binary (path and modification time), both in
+    process and on disk, so sibling processes such as Celery workers do not each
+    spawn Node.js just to check it.
+
+    Returns:
+        The CLI version, or None if ``gemini --version`` exited non-zero.
+
+    Raises:
+        RuntimeError: If the CLI is not installed, cannot be run, or the version check
+            times out.
+    """
+    cli_path = shutil.which("gemini")
+    if cli_path is None:
+        raise RuntimeError(CLI_NOT_FOUND)
+
+    try:
+        mtime_ns = os.stat(cli_path).st_mtime_ns
+    except OSError:
+        raise RuntimeError(CLI_NOT_FOUND)
+
+    try:
+        return _get_cli_version(cli_path, mtime_ns)
+    except _VersionCheckFailed:
+        return None
+
+
+def _cache_file() -> Path:
+    """Location of the on-disk CLI version cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "gemini-agent" / "cli-version.json"
+
+
+@lru_cache(maxsize=1)
+def _get_cli_version(cli_path: str, mtime_ns: int) -> str:
+    """
+    Read the CLI version from the disk cache, running the CLI on a miss.
+
+    Only successful checks are cached, so a transient failure is retried on the
+    next call.
+    """
+    cache_file = _cache_file()
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cached["path"] == cli_path and cached["mtime_ns"] == mtime_ns:
+            return cached["version"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    try:
+        result = subprocess.run([cli_path, "--version"], capture_output=True, timeout=10)
+    except FileNotFoundError:
+        raise RuntimeError(CLI_NOT_FOUND)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Gemini CLI version check timed out")
+    except OSError as e:
+        # A broken install, e.g. a corrupt or non-executable binary
+        raise RuntimeError(f"Gemini CLI could not be run: {e}")
+
+    if result.returncode != 0:
+        raise _VersionCheckFailed
+
+    version = result.stdout.decode("utf-8", errors="replace").strip()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        temp_file.write_text(
+            json.dumps({"path": cli_path, "mtime_ns": mtime_ns, "version": version}),
+            encoding="utf-8",
+        )
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        logger.debug(f"Could not cache Gemini CLI version: {e}")
+    return version
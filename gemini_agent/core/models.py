@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
+from gemini_agent.core.cli_detect import GEMINI_BIN
+
 
 class ApprovalMode(str, Enum):
     """Tool execution approval mode."""
@@ -31,6 +33,20 @@ class AgentConfig:
     approval_mode: ApprovalMode = ApprovalMode.YOLO
     sandbox: bool = False
     output_format: OutputFormat = OutputFormat.JSON
+    static_argv: tuple[str, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Precompute the CLI arguments that stay fixed for this configuration."""
+        argv = [GEMINI_BIN, "--output-format", self.output_format.value]
+        if self.model:
+            argv += ("--model", self.model)
+        if self.approval_mode == ApprovalMode.YOLO:
+            argv.append("-y")
+        elif self.approval_mode in (ApprovalMode.DEFAULT, ApprovalMode.AUTO_EDIT):
+            argv += ("--approval-mode", self.approval_mode.value)
+        if self.sandbox:
+            argv.append("--sandbox")
+        self.static_argv = tuple(argv)
 
 
 @dataclass
@@ -0,0 +1,35 @@
+"""Per-process reuse of GeminiAgent instances."""
+
+from functools import lru_cache
+from typing import Optional
+
+from gemini_agent.core.agent import GeminiAgent
+from gemini_agent.core.models import ApprovalMode, OutputFormat
+
+
+@lru_cache(maxsize=32)
+def get_agent(
+    api_key: Optional[str] = None,
+    model: str = "",
+    timeout: int = 300,
+    approval_mode: ApprovalMode = ApprovalMode.YOLO,
+    sandbox: bool = False,
+    output_format: OutputFormat = OutputFormat.JSON,
+) -> GeminiAgent:
+    """
+    Get a shared GeminiAgent for the given configuration.
+
+    Agents hold no per-run state, so long-lived processes such as Celery workers
+    can reuse one instance per configuration instead of constructing (and
+    verifying the CLI for) a new agent on every task.
+
+    Takes the same arguments as GeminiAgent().
+    """
+    return GeminiAgent(
+        api_key=api_key,
+        model=model,
+        timeout=timeout,
+        approval_mode=approval_mode,
+        sandbox=sandbox,
+        output_format=output_format,
+    )
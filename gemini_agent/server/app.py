@@ -1,29 +1,79 @@
 """FastAPI application for Gemini Agent API."""
 
-import subprocess
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import queue
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI
 
 from gemini_agent.server.config import get_settings
 from gemini_agent.server.routes import api_router
+from gemini_agent.server.routes.health import refresh_health_cache
+
+logger = logging.getLogger("gemini_agent.server")
+
+
+@contextmanager
+def _queued_logging(debug: bool) -> Iterator[None]:
+    """
+    Route gemini_agent logs to stderr through a background thread.
+
+    Records are queued by the calling thread and written by a QueueListener,
+    so a slow log sink never blocks the event loop. The listener runs in the
+    serving process for the app's lifetime, so pre-fork servers start one per
+    worker rather than losing it across the fork.
+    """
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s")
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    queue_handler = QueueHandler(log_queue)
+
+    package_logger = logging.getLogger("gemini_agent")
+    package_logger.addHandler(queue_handler)
+    package_logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    package_logger.propagate = False
+    listener.start()
+    try:
+        yield
+    finally:
+        # Flushes queued records before the handler is detached
+        listener.stop()
+        package_logger.removeHandler(queue_handler)
+        package_logger.propagate = True
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     settings = get_settings()
-    print(f"🚀 Starting {settings.app_name} v{settings.app_version}")
-    print(f"📡 Redis: {settings.redis_url}")
-
-    try:
-        result = subprocess.run(["gemini", "--version"], capture_output=True, text=True, timeout=10)
-        print(f"🤖 Gemini CLI: {result.stdout.strip()}")
-    except Exception as e:
-        print(f"⚠️ Gemini CLI: {e}")
-
-    yield
-    print("👋 Shutting down...")
+    with _queued_logging(settings.debug):
+        # Bound blocking CLI probes run via asyncio.to_thread to the CLI concurrency
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=settings.cli_concurrency, thread_name_prefix="gemini-cli"
+            )
+        )
+        logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+        logger.info("Redis: %s", settings.redis_url)
+
+        health = await refresh_health_cache(
+            settings.health_cache_ttl, settings.mcp_list_from_settings_files
+        )
+        if health.gemini_version:
+            logger.info("Gemini CLI: %s", health.gemini_version)
+        else:
+            logger.warning("Gemini CLI: not available")
+
+        yield
+        logger.info("Shutting down")
 
 
 def create_app() -> FastAPI:
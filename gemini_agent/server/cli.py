@@ -0,0 +1,160 @@
+"""Async execution of Gemini CLI management commands for the API routes."""
+
+import asyncio
+import json
+import subprocess
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+
+from gemini_agent.core.cli_detect import GEMINI_BIN
+from gemini_agent.server.config import get_settings
+
+# Listings that change rarely, keyed by name: (fetched_at, value)
+_cache: dict[str, tuple[float, Any]] = {}
+_cache_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+@lru_cache
+def _cli_slots() -> asyncio.Semaphore:
+    """Get the semaphore capping concurrent CLI processes across all routes."""
+    # Created on first use so settings are read at runtime, not at import
+    return asyncio.Semaphore(get_settings().cli_concurrency)
+
+
+async def run_cli(*args: str, timeout: float = 30) -> subprocess.CompletedProcess:
+    """
+    Run ``gemini <args>`` without blocking the event loop.
+
+    At most ``cli_concurrency`` CLI processes run at once; further calls wait
+    for a free slot.
+
+    Args:
+        args: Arguments passed to the Gemini CLI.
+        timeout: Seconds to wait before killing the CLI.
+
+    Returns:
+        The completed process with decoded stdout and stderr.
+
+    Raises:
+        HTTPException: 504 if the CLI did not finish within timeout.
+    """
+    command = [GEMINI_BIN, *args]
+    async with _cli_slots():
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # With an absolute path and no fds to close, CPython can use posix_spawn
+            close_fds=False,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except BaseException as e:
+            # Never leave the CLI running after a timeout or a cancelled request
+            with suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()
+            if isinstance(e, TimeoutError):
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail=f"Gemini CLI timed out after {timeout} seconds",
+                )
+            raise
+
+    return subprocess.CompletedProcess(
+        command,
+        proc.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+def output_lines(result: subprocess.CompletedProcess) -> list[str]:
+    """Non-empty, stripped stdout lines of a successful CLI listing command."""
+    if result.returncode != 0:
+        return []
+    return [line for line in map(str.strip, result.stdout.splitlines()) if line]
+
+
+def read_mcp_server_names() -> Optional[list[str]]:
+    """
+    Read configured MCP server names from the Gemini CLI settings files.
+
+    Merges the user (~/.gemini/settings.json) and workspace (./.gemini/settings.json)
+    scopes without starting Node.js. Unlike ``gemini mcp list``, this does not see
+    servers from system-wide settings or from installed extensions.
+
+    Returns:
+        Server names, or None if a settings file could not be parsed (for example
+        because it contains comments) and the CLI should be asked instead.
+    """
+    names: dict[str, None] = {}
+    for path in (
+        Path.home() / ".gemini" / "settings.json",
+        Path.cwd() / ".gemini" / "settings.json",
+    ):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError):
+            return None
+        servers = data.get("mcpServers") if isinstance(data, dict) else None
+        if isinstance(servers, dict):
+            names.update(dict.fromkeys(servers))
+    return list(names)
+
+
+async def list_mcp_server_names(
+    from_settings_files: bool = False, timeout: float = 30
+) -> list[str]:
+    """
+    List configured MCP servers with ``gemini mcp list``.
+
+    Args:
+        from_settings_files: Read the user and workspace settings files instead of
+            starting the CLI (see read_mcp_server_names), falling back to the CLI
+            if they can't be parsed. Misses system and extension servers.
+        timeout: Seconds to wait for the CLI when it is used.
+    """
+    if from_settings_files:
+        names = read_mcp_server_names()
+        if names is not None:
+            return names
+
+    result = await run_cli("mcp", "list", timeout=timeout)
+
+    return output_lines(result)
+
+
+async def cached(key: str, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached value for key, calling loader when it is older than ttl.
+
+    Concurrent misses for the same key wait for a single loader call instead of
+    each spawning the CLI.
+    """
+    entry = _cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+
+    async with _cache_locks[key]:
+        # Another request may have refreshed the entry while we waited
+        entry = _cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        value = await loader()
+        _cache[key] = (time.monotonic(), value)
+        return value
+
+
+def invalidate(key: str) -> None:
+    """Drop a cached value so the next request reloads it."""
+    _cache.pop(key, None)
@@ -1,7 +1,9 @@
 """Configuration for Gemini Agent API Server."""
 
+import os
 from functools import lru_cache
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from gemini_agent._version import __version__
@@ -25,6 +27,12 @@ class Settings(BaseSettings):
     gemini_api_key: str = ""
     gemini_timeout: int = 300
     gemini_model: str = ""  # Empty = let Gemini CLI choose
+    mcp_list_from_settings_files: bool = False  # Read settings.json instead of `gemini mcp list`
+
+    # Health check settings
+    health_cache_ttl: int = 60  # Seconds to reuse the Gemini CLI probe
+    cli_cache_ttl: float = 5.0  # Seconds to reuse MCP server and extension listings
+    cli_concurrency: int = Field(default_factory=lambda: os.cpu_count() or 4)  # Max CLI processes
 
     # Redis and Celery settings
     redis_url: str = "redis://redis:6379/0"
@@ -35,6 +43,16 @@ class Settings(BaseSettings):
     task_soft_time_limit: int = 300
     task_time_limit: int = 360
 
+    # Task submission settings
+    task_dedupe: bool = False  # Join identical unfinished tasks instead of running them twice
+
+    # Worker settings
+    worker_pool: str = "prefork"  # "threads" packs more CLI runs per process
+    worker_concurrency: int = 4
+
+    # Task polling settings
+    task_retry_after: int = 1  # Retry-After hint (seconds) for unfinished tasks
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -80,6 +80,33 @@ class TaskResultResponse(BaseModel):
     error: Optional[str] = None
 
 
+class BatchTaskRequest(BaseModel):
+    """Request model for submitting several tasks at once."""
+
+    tasks: list[TaskRequest] = Field(
+        ..., min_length=1, max_length=100, description="Tasks to submit together"
+    )
+
+
+class BatchCreateResponse(BaseModel):
+    """Response when a batch of tasks is created."""
+
+    batch_id: str
+    task_ids: list[str]
+    status: TaskStatus = TaskStatus.PENDING
+    message: str = "Batch submitted successfully"
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class BatchResultResponse(BaseModel):
+    """Response with the status and result of every task in a batch."""
+
+    batch_id: str
+    completed: int
+    total: int
+    tasks: list[TaskResultResponse]
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
 
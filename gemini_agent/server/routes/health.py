@@ -1,43 +1,79 @@
 """Health check endpoints."""
 
-import subprocess
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from gemini_agent.server.config import get_settings
+from gemini_agent.core.cli_detect import detect_gemini_cli
+from gemini_agent.server.cli import list_mcp_server_names
+from gemini_agent.server.config import Settings, get_settings
 from gemini_agent.server.models import HealthResponse
 
 router = APIRouter(tags=["Health"])
-settings = get_settings()
 
 
-@router.get("/", response_model=HealthResponse)
-@router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
-    """Health check with Gemini CLI version and MCP servers."""
+@dataclass
+class _HealthCache:
+    """Snapshot of the Gemini CLI state reported by the health check."""
+
+    gemini_version: Optional[str] = None
+    mcp_servers: list[str] = field(default_factory=list)
+    expires_at: float = 0.0
+
+
+_cache = _HealthCache()
+_refresh_lock = asyncio.Lock()
+
+
+async def _probe_cli(ttl: float, mcp_from_settings_files: bool) -> _HealthCache:
+    """Query the Gemini CLI for its version and configured MCP servers."""
     gemini_version = None
     mcp_servers = []
 
     try:
-        result = subprocess.run(["gemini", "--version"], capture_output=True, text=True, timeout=10)
-        gemini_version = result.stdout.strip()
-    except Exception:
+        gemini_version = await asyncio.to_thread(detect_gemini_cli)
+    except RuntimeError:
         pass
 
     try:
-        result = subprocess.run(
-            ["gemini", "mcp", "list"], capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
-                if line.strip():
-                    mcp_servers.append(line.strip())
+        mcp_servers = await list_mcp_server_names(mcp_from_settings_files, timeout=10)
     except Exception:
         pass
 
+    return _HealthCache(
+        gemini_version=gemini_version,
+        mcp_servers=mcp_servers,
+        expires_at=time.monotonic() + ttl,
+    )
+
+
+async def refresh_health_cache(ttl: float, mcp_from_settings_files: bool) -> _HealthCache:
+    """Re-probe the Gemini CLI and keep the snapshot for ttl seconds."""
+    global _cache
+
+    async with _refresh_lock:
+        # Another request may have refreshed the snapshot while we waited
+        if time.monotonic() >= _cache.expires_at:
+            _cache = await _probe_cli(ttl, mcp_from_settings_files)
+    return _cache
+
+
+@router.get("/", response_model=HealthResponse)
+@router.get("/health", response_model=HealthResponse)
+async def health_check(settings: Settings = Depends(get_settings)) -> HealthResponse:
+    """Health check with Gemini CLI version and MCP servers."""
+    cache = _cache
+    if time.monotonic() >= cache.expires_at:
+        cache = await refresh_health_cache(
+            settings.health_cache_ttl, settings.mcp_list_from_settings_files
+        )
+
     return HealthResponse(
         app_name=settings.app_name,
         app_version=settings.app_version,
-        gemini_cli_version=gemini_version,
-        mcp_servers=mcp_servers,
+        gemini_cli_version=cache.gemini_version,
+        mcp_servers=cache.mcp_servers,
     )
@@ -1,9 +1,9 @@
 """MCP server management endpoints."""
 
-import subprocess
-
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 
+from gemini_agent.server.cli import cached, invalidate, list_mcp_server_names, run_cli
+from gemini_agent.server.config import Settings, get_settings
 from gemini_agent.server.models import (
     MCPServerListResponse,
     MCPServerRequest,
@@ -12,25 +12,27 @@ from gemini_agent.server.models import (
 
 router = APIRouter(prefix="/mcp/servers", tags=["MCP"])
 
+_MCP_LIST_KEY = "mcp_list"
+
+
+async def _load_mcp_servers(from_settings_files: bool) -> list[dict[str, str]]:
+    """Read the configured MCP servers."""
+    names = await list_mcp_server_names(from_settings_files)
+    return [{"name": name, "status": "configured"} for name in names]
+
 
 @router.get("", response_model=MCPServerListResponse)
-async def list_mcp_servers() -> MCPServerListResponse:
+async def list_mcp_servers(settings: Settings = Depends(get_settings)) -> MCPServerListResponse:
     """List all configured MCP servers."""
     try:
-        result = subprocess.run(
-            ["gemini", "mcp", "list"],
-            capture_output=True,
-            text=True,
-            timeout=30,
+        servers = await cached(
+            _MCP_LIST_KEY,
+            settings.cli_cache_ttl,
+            lambda: _load_mcp_servers(settings.mcp_list_from_settings_files),
         )
-
-        servers = []
-        if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split("\n"):
-                if line.strip():
-                    servers.append({"name": line.strip(), "status": "configured"})
-
         return MCPServerListResponse(servers=servers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list MCP servers: {e}")
 
@@ -39,13 +41,14 @@ async def list_mcp_servers() -> MCPServerListResponse:
 async def add_mcp_server(request: MCPServerRequest) -> MCPServerResponse:
     """Register an MCP server with Gemini CLI."""
     try:
-        command = ["gemini", "mcp", "add", request.name, request.url]
+        command = ["mcp", "add", request.name, request.url]
         if request.args:
             command.extend(request.args)
 
-        result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+        result = await run_cli(*command)
 
         if result.returncode == 0:
+            invalidate(_MCP_LIST_KEY)
             return MCPServerResponse(
                 name=request.name,
                 status="added",
@@ -57,6 +60,8 @@ async def add_mcp_server(request: MCPServerRequest) -> MCPServerResponse:
                 status="error",
                 message=result.stderr or result.stdout or "Unknown error",
             )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add MCP server: {e}")
 
@@ -65,14 +70,10 @@ async def add_mcp_server(request: MCPServerRequest) -> MCPServerResponse:
 async def remove_mcp_server(name: str) -> MCPServerResponse:
     """Remove an MCP server from Gemini CLI."""
     try:
-        result = subprocess.run(
-            ["gemini", "mcp", "remove", name],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = await run_cli("mcp", "remove", name)
 
         if result.returncode == 0:
+            invalidate(_MCP_LIST_KEY)
             return MCPServerResponse(
                 name=name,
                 status="removed",
@@ -84,5 +85,7 @@ async def remove_mcp_server(name: str) -> MCPServerResponse:
                 status="error",
                 message=result.stderr or result.stdout or "Server not found",
             )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to remove MCP server: {e}")
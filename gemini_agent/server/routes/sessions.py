@@ -1,32 +1,28 @@
 """Sessions and extensions endpoints."""
 
-import subprocess
-
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 
+from gemini_agent.server.cli import cached, output_lines, run_cli
+from gemini_agent.server.config import Settings, get_settings
 from gemini_agent.server.models import ExtensionListResponse, SessionListResponse
 
 router = APIRouter(tags=["Sessions"])
 
 
+async def _load_extensions() -> list[dict[str, str]]:
+    """Read the available extensions from the Gemini CLI."""
+    result = await run_cli("--list-extensions")
+    return [{"name": line} for line in output_lines(result)]
+
+
 @router.get("/extensions", response_model=ExtensionListResponse, tags=["Extensions"])
-async def list_extensions() -> ExtensionListResponse:
+async def list_extensions(settings: Settings = Depends(get_settings)) -> ExtensionListResponse:
     """List all available Gemini CLI extensions."""
     try:
-        result = subprocess.run(
-            ["gemini", "--list-extensions"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-
-        extensions = []
-        if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split("\n"):
-                if line.strip():
-                    extensions.append({"name": line.strip()})
-
+        extensions = await cached("extensions", settings.cli_cache_ttl, _load_extensions)
         return ExtensionListResponse(extensions=extensions)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list extensions: {e}")
 
@@ -35,20 +31,11 @@ async def list_extensions() -> ExtensionListResponse:
 async def list_sessions() -> SessionListResponse:
     """List available sessions."""
     try:
-        result = subprocess.run(
-            ["gemini", "--list-sessions"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-
-        sessions = []
-        if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split("\n"):
-                if line.strip():
-                    sessions.append({"session": line.strip()})
-
+        result = await run_cli("--list-sessions")
+        sessions = [{"session": line} for line in output_lines(result)]
         return SessionListResponse(sessions=sessions)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list sessions: {e}")
 
@@ -57,12 +44,7 @@ async def list_sessions() -> SessionListResponse:
 async def delete_session(session_id: str) -> None:
     """Delete a session by index number."""
     try:
-        result = subprocess.run(
-            ["gemini", "--delete-session", session_id],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = await run_cli("--delete-session", session_id)
 
         if result.returncode != 0:
             raise HTTPException(
@@ -1,52 +1,40 @@
 """Task execution endpoints."""
 
+import asyncio
+import hashlib
 import json
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Final, Optional
 
-from celery.result import AsyncResult
-from fastapi import APIRouter, status
+import orjson
+import redis.asyncio as aioredis
+from celery import Signature, group, states
+from celery.result import GroupResult
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
-from gemini_agent.server.config import get_settings
+from gemini_agent.server.config import Settings, get_settings
 from gemini_agent.server.models import (
+    BatchCreateResponse,
+    BatchResultResponse,
+    BatchTaskRequest,
     TaskCreateResponse,
     TaskRequest,
     TaskResultResponse,
     TaskStatus,
 )
-from gemini_agent.server.worker import celery_app, run_gemini_task
+from gemini_agent.server.worker import celery_app, message_serializer, run_gemini_task
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
-settings = get_settings()
 
-
-@router.post("", response_model=TaskCreateResponse, status_code=status.HTTP_202_ACCEPTED)
-async def create_task(request: TaskRequest) -> TaskCreateResponse:
-    """Submit a new task to Gemini CLI."""
-    full_prompt = request.prompt
-    if request.context:
-        context_str = json.dumps(request.context, indent=2)
-        full_prompt = f"{request.prompt}\n\n---\n\nContext:\n{context_str}"
-
-    task = run_gemini_task.delay(
-        prompt=full_prompt,
-        files=request.files,
-        model=request.model or settings.gemini_model,
-        approval_mode=request.approval_mode.value,
-        sandbox=request.sandbox,
-        mcp_servers=request.mcp_servers,
-        allowed_tools=request.allowed_tools,
-        extensions=request.extensions,
-        include_directories=request.include_directories,
-        output_format=request.output_format.value,
-    )
-    return TaskCreateResponse(task_id=task.id, status=TaskStatus.PENDING)
-
-
-@router.get("/{task_id}", response_model=TaskResultResponse)
-async def get_task(task_id: str) -> TaskResultResponse:
-    """Get task status and result."""
-    async_result = AsyncResult(task_id, app=celery_app)
-
-    status_map = {
+_STATUS_MAP: Final[Mapping[str, TaskStatus]] = MappingProxyType(
+    {
         "PENDING": TaskStatus.PENDING,
         "STARTED": TaskStatus.STARTED,
         "SUCCESS": TaskStatus.SUCCESS,
@@ -54,23 +42,335 @@ async def get_task(task_id: str) -> TaskResultResponse:
         "RETRY": TaskStatus.RETRY,
         "REVOKED": TaskStatus.REVOKED,
     }
+)
+# Celery backends are per-thread; every route here runs on the event loop thread
+_backend = celery_app.backend
+
+_FINISHED_STATUSES = frozenset({TaskStatus.SUCCESS, TaskStatus.FAILURE, TaskStatus.REVOKED})
+_KEEPALIVE_INTERVAL = 15.0
+
+# Maps a task payload digest to the ID of the task running it, and back
+_DEDUPE_KEY_PREFIX = "gemini-agent:dedupe:"
+_DEDUPE_TASK_PREFIX = "gemini-agent:dedupe-task:"
+# Deletes a task's reverse entry, and its dedupe key only while that still maps to the task
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    redis.call("DEL", KEYS[1])
+end
+return redis.call("DEL", KEYS[2])
+"""
+
+# Finished task results don't change until they expire from the backend, so
+# polls for them are answered from a per-process LRU: task_id -> (expires_at, response)
+_TERMINAL_CACHE_SIZE = 4096
+_terminal_cache: OrderedDict[str, tuple[float, TaskResultResponse]] = OrderedDict()
+
+
+@lru_cache
+def _get_redis() -> aioredis.Redis:
+    """Get the shared async Redis client used to watch the result backend."""
+    return aioredis.from_url(get_settings().celery_result_backend)
+
+
+async def _wait_for_update(task_id: str, timeout: float) -> None:
+    """Block until the result backend publishes a state change for a task or timeout expires."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    # The Redis result backend publishes every stored state on the task's meta key
+    async with _get_redis().pubsub() as pubsub:
+        await pubsub.subscribe(_backend.get_key_for_task(task_id))
+
+        # The task may have finished before the subscription became active
+        if _task_meta(task_id)["status"] in states.READY_STATES:
+            return
+
+        while (remaining := deadline - loop.time()) > 0:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message is not None:
+                return
 
-    current_status = status_map.get(async_result.status, TaskStatus.PENDING)
-    response = TaskResultResponse(task_id=task_id, status=current_status)
+
+def _task_meta(task_id: str) -> dict[str, Any]:
+    """Fetch a task's status and result from the result backend in one round-trip."""
+    return _backend.get_task_meta(task_id)
+
+
+def _task_metas(task_ids: list[str]) -> list[dict[str, Any]]:
+    """Fetch the status and result of several tasks with a single MGET."""
+    keys = [_backend.get_key_for_task(task_id) for task_id in task_ids]
+    values = _backend.mget(keys)
+    if isinstance(values, dict):
+        # Some key-value backends return a mapping instead of a list
+        values = [values.get(key) for key in keys]
+    return [
+        _backend.decode_result(value) if value else {"status": states.PENDING, "result": None}
+        for value in values
+    ]
+
+
+def _task_response(task_id: str, meta: Optional[dict[str, Any]] = None) -> TaskResultResponse:
+    """Build the status response for a task from its result backend metadata."""
+    if meta is None:
+        meta = _task_meta(task_id)
+
+    current_status = _STATUS_MAP.get(meta["status"], TaskStatus.PENDING)
+    result = None
+    error = None
 
     if current_status == TaskStatus.SUCCESS:
-        response.result = async_result.result
+        result = meta["result"]
     elif current_status == TaskStatus.FAILURE:
         try:
-            response.error = str(async_result.result) if async_result.result else "Unknown error"
+            error = str(meta["result"]) if meta["result"] else "Unknown error"
         except Exception:
-            response.error = "Unable to retrieve error details"
+            error = "Unable to retrieve error details"
+
+    return TaskResultResponse(task_id=task_id, status=current_status, result=result, error=error)
 
+
+def _cached_response(task_id: str) -> Optional[TaskResultResponse]:
+    """Return the cached response for a finished task, if still valid."""
+    entry = _terminal_cache.get(task_id)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if time.monotonic() >= expires_at:
+        del _terminal_cache[task_id]
+        return None
+    _terminal_cache.move_to_end(task_id)
     return response
 
 
+def _result_ttl(meta: dict[str, Any]) -> Optional[float]:
+    """Seconds until a finished task's result expires from the backend, if known."""
+    expires = _backend.expires
+    if not expires:
+        return float("inf")
+
+    date_done = meta.get("date_done")
+    if isinstance(date_done, str):
+        date_done = datetime.fromisoformat(date_done)
+    if not isinstance(date_done, datetime):
+        return None
+    if date_done.tzinfo is None:
+        date_done = date_done.replace(tzinfo=timezone.utc)
+    return date_done.timestamp() + expires - time.time()
+
+
+def _remember_response(response: TaskResultResponse, meta: dict[str, Any]) -> None:
+    """Cache a finished task's response until its result expires from the backend."""
+    if response.status not in _FINISHED_STATUSES:
+        return
+    ttl = _result_ttl(meta)
+    if ttl is None or ttl <= 0:
+        return
+    expires_at = time.monotonic() + ttl
+    _terminal_cache[response.task_id] = (expires_at, response)
+    _terminal_cache.move_to_end(response.task_id)
+    if len(_terminal_cache) > _TERMINAL_CACHE_SIZE:
+        _terminal_cache.popitem(last=False)
+
+
+async def _task_events(task_id: str) -> AsyncIterator[str]:
+    """Yield SSE frames for each task state change, ending after a finished state."""
+    last_status = None
+
+    async with _get_redis().pubsub() as pubsub:
+        await pubsub.subscribe(_backend.get_key_for_task(task_id))
+
+        while True:
+            response = _task_response(task_id)
+            if response.status != last_status:
+                last_status = response.status
+                yield f"data: {response.model_dump_json()}\n\n"
+            if response.status in _FINISHED_STATUSES:
+                return
+
+            # Comment frames keep idle connections open through proxies
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=_KEEPALIVE_INTERVAL
+                )
+                if message is not None:
+                    break
+                yield ": keep-alive\n\n"
+
+
+def _task_kwargs(request: TaskRequest, settings: Settings) -> dict[str, Any]:
+    """Build the run_gemini_task arguments for a task request."""
+    # Context is sent separately and joined into the prompt by the worker
+    return {
+        "prompt": request.prompt,
+        "context": request.context,
+        "files": request.files,
+        "model": request.model or settings.gemini_model,
+        "approval_mode": request.approval_mode.value,
+        "sandbox": request.sandbox,
+        "mcp_servers": request.mcp_servers,
+        "allowed_tools": request.allowed_tools,
+        "extensions": request.extensions,
+        "include_directories": request.include_directories,
+        "output_format": request.output_format.value,
+    }
+
+
+def _task_signature(request: TaskRequest, settings: Settings) -> Signature:
+    """Build the run_gemini_task signature for one task of a batch."""
+    kwargs = _task_kwargs(request, settings)
+    return run_gemini_task.s(**kwargs).set(serializer=message_serializer(kwargs))
+
+
+def _dedupe_key(payload: dict[str, Any]) -> str:
+    """Build the dedupe key for a task payload from a digest of its canonical JSON."""
+    try:
+        encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        # orjson rejects integers outside the 64-bit range and lone surrogates
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return _DEDUPE_KEY_PREFIX + hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+async def _claim_task_id(key: str) -> tuple[str, Optional[TaskStatus]]:
+    """
+    Reserve a task ID under a dedupe key, reusing the task already running it.
+
+    Returns:
+        The task ID and, if an identical task is still unfinished, its status
+        (None means the ID is new and the task must be submitted).
+    """
+    task_id = str(uuid.uuid4())
+    ttl = _backend.expires or None
+    redis = _get_redis()
+
+    # SET NX GET claims the key atomically and returns any existing task ID
+    existing = await redis.set(key, task_id, nx=True, get=True, ex=ttl)
+    if existing is not None:
+        existing_id = existing.decode()
+        current_status = _STATUS_MAP.get(_task_meta(existing_id)["status"], TaskStatus.PENDING)
+        if current_status not in _FINISHED_STATUSES:
+            return existing_id, current_status
+        await redis.set(key, task_id, ex=ttl)
+    # Lets a cancel find the key to release
+    await redis.set(_DEDUPE_TASK_PREFIX + task_id, key, ex=ttl)
+    return task_id, None
+
+
+async def _release_task_id(key: str, task_id: str) -> None:
+    """Drop the dedupe key of a task that could not be submitted or was cancelled."""
+    await _get_redis().eval(_RELEASE_SCRIPT, 2, key, _DEDUPE_TASK_PREFIX + task_id, task_id)
+
+
+@router.post("", response_model=TaskCreateResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_task(
+    request: TaskRequest, settings: Settings = Depends(get_settings)
+) -> TaskCreateResponse:
+    """Submit a new task to Gemini CLI, joining an identical unfinished task if one exists."""
+    payload = _task_kwargs(request, settings)
+    serializer = message_serializer(payload)
+    if not settings.task_dedupe:
+        task = run_gemini_task.apply_async(kwargs=payload, serializer=serializer)
+        return TaskCreateResponse(task_id=task.id, status=TaskStatus.PENDING)
+
+    key = _dedupe_key(payload)
+    task_id, current_status = await _claim_task_id(key)
+    if current_status is not None:
+        return TaskCreateResponse(
+            task_id=task_id,
+            status=current_status,
+            message="Identical task already in progress",
+        )
+
+    try:
+        run_gemini_task.apply_async(kwargs=payload, task_id=task_id, serializer=serializer)
+    except Exception:
+        # Otherwise identical requests would join a task that was never queued
+        await _release_task_id(key, task_id)
+        raise
+    return TaskCreateResponse(task_id=task_id, status=TaskStatus.PENDING)
+
+
+# Batch routes are declared before /{task_id} routes so "batch" is never read as a task ID
+@router.post("/batch", response_model=BatchCreateResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_batch(
+    request: BatchTaskRequest, settings: Settings = Depends(get_settings)
+) -> BatchCreateResponse:
+    """Submit several tasks in one broker round-trip."""
+    job = group(_task_signature(task, settings) for task in request.tasks).apply_async()
+    # Persist the group so its members can be looked up by batch ID
+    job.save()
+    return BatchCreateResponse(batch_id=job.id, task_ids=[result.id for result in job.results])
+
+
+@router.get("/batch/{batch_id}", response_model=BatchResultResponse)
+async def get_batch(batch_id: str) -> BatchResultResponse:
+    """Get the status and result of every task in a batch."""
+    job = GroupResult.restore(batch_id, app=celery_app)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+
+    task_ids = [result.id for result in job.results]
+    tasks = [
+        _task_response(task_id, meta) for task_id, meta in zip(task_ids, _task_metas(task_ids))
+    ]
+    return BatchResultResponse(
+        batch_id=batch_id,
+        completed=sum(task.status in _FINISHED_STATUSES for task in tasks),
+        total=len(tasks),
+        tasks=tasks,
+    )
+
+
+@router.get("/{task_id}", response_model=TaskResultResponse)
+async def get_task(
+    task_id: str,
+    http_response: Response,
+    wait: Optional[float] = Query(
+        None, ge=0, le=60, description="Seconds to wait for a state change before responding"
+    ),
+    settings: Settings = Depends(get_settings),
+) -> TaskResultResponse:
+    """Get task status and result, optionally long-polling until the state changes."""
+    cached_response = _cached_response(task_id)
+    if cached_response is not None:
+        return cached_response
+
+    meta = _task_meta(task_id)
+    if wait and meta["status"] not in states.READY_STATES:
+        await _wait_for_update(task_id, wait)
+        meta = _task_meta(task_id)
+
+    response = _task_response(task_id, meta)
+    if response.status in _FINISHED_STATUSES:
+        _remember_response(response, meta)
+    else:
+        http_response.headers["Retry-After"] = str(settings.task_retry_after)
+    return response
+
+
+@router.get("/{task_id}/events")
+async def stream_task_events(task_id: str) -> StreamingResponse:
+    """Stream task status changes as Server-Sent Events until the task finishes."""
+    return StreamingResponse(
+        _task_events(task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_task(task_id: str) -> None:
-    """Cancel a pending or running task."""
-    async_result = AsyncResult(task_id, app=celery_app)
-    async_result.revoke(terminate=True)
+    """
+    Cancel a pending or running task.
+
+    Running tasks are only terminated on prefork workers; the threads pool
+    can only stop tasks that have not started yet.
+    """
+    celery_app.control.revoke(task_id, terminate=True)
+    _terminal_cache.pop(task_id, None)
+
+    # A revoked task stays PENDING until a worker sees it, so identical requests
+    # would otherwise keep joining it
+    key = await _get_redis().get(_DEDUPE_TASK_PREFIX + task_id)
+    if key is not None:
+        await _release_task_id(key.decode(), task_id)
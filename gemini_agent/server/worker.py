@@ -3,16 +3,34 @@ Celery worker for async Gemini CLI task execution.
 
 This module provides the Celery app and task for processing
 Gemini prompts asynchronously.
+
+The worker uses Celery's prefork pool by default, which enforces the task
+time limits and lets DELETE /tasks/{id} terminate running tasks. Tasks spend
+nearly all their time waiting on the Gemini CLI subprocess, so deployments
+that need many concurrent runs can opt into WORKER_POOL=threads with a high
+WORKER_CONCURRENCY: one process then multiplexes many in-flight CLI runs. The
+threads pool gives no CPU parallelism for the Python side of a task, does not
+enforce Celery time limits (runs are bounded only by GEMINI_TIMEOUT), and
+cannot terminate running tasks, so cancelling only stops tasks not yet started.
 """
 
+import json
+import logging
+import socket
 from typing import Any, Dict, Optional
 
+import orjson
 from celery import Celery
+from celery.signals import worker_init
+from kombu.exceptions import EncodeError
+from kombu.serialization import dumps
 
-from gemini_agent.core import GeminiAgent
+from gemini_agent.core import get_agent
 from gemini_agent.core.models import ApprovalMode, OutputFormat
 from gemini_agent.server.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
 celery_app = Celery(
@@ -22,25 +40,102 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # msgpack keeps large inline file payloads compact; json is still accepted
+    # so messages from older API processes, and tasks whose context msgpack
+    # cannot encode (see message_serializer), can be consumed
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
     timezone="UTC",
     enable_utc=True,
     task_soft_time_limit=settings.task_soft_time_limit,
     task_time_limit=settings.task_time_limit,
+    # Store STARTED so status polls and the event stream report running tasks
+    task_track_started=True,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=1,
-    worker_concurrency=4,
+    worker_pool=settings.worker_pool,
+    worker_concurrency=settings.worker_concurrency,
     result_expires=3600,
+    # Keep a bounded pool of long-lived Redis connections instead of reconnecting
+    broker_pool_limit=32,
+    redis_max_connections=64,
+    redis_socket_keepalive=True,
+    broker_transport_options={
+        "socket_keepalive": True,
+        "socket_keepalive_options": (
+            {socket.TCP_KEEPIDLE: 60} if hasattr(socket, "TCP_KEEPIDLE") else {}
+        ),
+    },
+    # Namespace result keys (and their pub/sub channels) for this service
+    result_backend_transport_options={"global_keyprefix": "ga:"},
 )
 
+# Routes send enum values already validated by pydantic; map them back by lookup
+_APPROVAL = {mode.value: mode for mode in ApprovalMode}
+_OUTPUT = {fmt.value: fmt for fmt in OutputFormat}
+
+
+def message_serializer(kwargs: Dict[str, Any]) -> str:
+    """
+    Pick the serializer for a run_gemini_task message.
+
+    Messages use msgpack unless it cannot encode the task arguments, for example
+    integers outside the 64-bit range or strings with lone surrogates, which are
+    valid JSON; those messages fall back to JSON.
+    """
+    try:
+        dumps(kwargs, serializer="msgpack")
+    except EncodeError:
+        return "json"
+    return "msgpack"
+
+
+@worker_init.connect
+def warm_up_agent(**kwargs) -> None:
+    """
+    Build the default agent when the worker starts.
+
+    The Gemini CLI has no persistent request mode, so each task still starts
+    its own CLI process; this moves the one-off CLI check and agent setup out
+    of the first task's latency. Prefork children inherit the warmed agent.
+    """
+    try:
+        get_agent(
+            api_key=settings.gemini_api_key,
+            model=settings.gemini_model,
+            timeout=settings.gemini_timeout,
+            approval_mode=ApprovalMode.YOLO,
+            sandbox=False,
+            output_format=OutputFormat.JSON,
+        )
+    except RuntimeError as e:
+        logger.warning("Gemini CLI warm-up failed: %s", e)
+
+
+def _build_prompt(prompt: str, context: Optional[Dict[str, Any]]) -> str:
+    """Append the request context to the prompt."""
+    if not context:
+        return prompt
+    # Pretty-printing costs CPU and tokens; the model doesn't need it
+    option = orjson.OPT_INDENT_2 if settings.debug else 0
+    try:
+        context_str = orjson.dumps(context, option=option).decode()
+    except TypeError:
+        # orjson rejects integers outside the 64-bit range and lone surrogates
+        if settings.debug:
+            context_str = json.dumps(context, indent=2)
+        else:
+            context_str = json.dumps(context, separators=(",", ":"))
+    return f"{prompt}\n\n---\n\nContext:\n{context_str}"
+
 
 @celery_app.task(bind=True, name="run_gemini_task", max_retries=2, default_retry_delay=30)
 def run_gemini_task(
     self,
     prompt: str,
+    context: Optional[Dict[str, Any]] = None,
     files: Optional[Dict[str, str]] = None,
     model: Optional[str] = None,
     approval_mode: str = "yolo",
@@ -55,28 +150,26 @@ def run_gemini_task(
     """
     Execute a Gemini CLI task asynchronously.
 
-    This task wraps the GeminiAgent.run() method for Celery execution.
+    This task wraps the GeminiAgent.run() method for Celery execution,
+    reusing one agent per configuration within the worker process.
     """
-    import logging
-
-    logger = logging.getLogger(__name__)
     task_id = self.request.id
 
-    logger.info(f"[{task_id}] Starting Gemini task")
-    logger.info(f"[{task_id}] Prompt (first 100 chars): {prompt[:100]}...")
+    logger.info("[%s] Starting Gemini task", task_id)
+    logger.info("[%s] Prompt (first 100 chars): %.100s...", task_id, prompt)
 
     try:
-        agent = GeminiAgent(
+        agent = get_agent(
             api_key=settings.gemini_api_key,
             model=model or settings.gemini_model,
             timeout=settings.gemini_timeout,
-            approval_mode=ApprovalMode(approval_mode),
+            approval_mode=_APPROVAL[approval_mode],
             sandbox=sandbox,
-            output_format=OutputFormat(output_format),
+            output_format=_OUTPUT[output_format],
         )
 
         result = agent.run(
-            prompt=prompt,
+            prompt=_build_prompt(prompt, context),
             files=files,
             mcp_servers=mcp_servers,
             allowed_tools=allowed_tools,
@@ -85,7 +178,7 @@ def run_gemini_task(
             resume_session=resume_session,
         )
 
-        logger.info(f"[{task_id}] Task completed: success={result.success}")
+        logger.info("[%s] Task completed: success=%s", task_id, result.success)
 
         return {
             "success": result.success,
@@ -105,9 +198,9 @@ def run_gemini_task(
         }
 
     except Exception as e:
-        logger.exception(f"[{task_id}] Error executing task: {e}")
+        logger.exception("[%s] Error executing task: %s", task_id, e)
         try:
-            raise self.retry(exc=e)
+            raise self.retry(exc=e, serializer=message_serializer(self.request.kwargs))
         except self.MaxRetriesExceededError:
             return {
                 "success": False,